@@ -1,10 +1,11 @@
 import streamlit as st
-import pandas as pd
 from sqlalchemy import text # Import the text function
 
+from projekt_01 import db
+
 # --- Connection Setup (Streamlit reads from .streamlit/secrets.toml automatically) ---
 try:
-    conn = st.connection("postgresql", type="sql")
+    conn = db.get_connection()
 except Exception as e:
     st.error(f"Failed to connect to the database. Check your configuration in .streamlit/secrets.toml and ensure the Postgres Docker container is running.")
     st.error(f"Error: {e}")
@@ -13,50 +14,65 @@ except Exception as e:
 # --- ONE-TIME DATA MIGRATION SCRIPT ---
 # This script will run once to rename the old table and its columns to the new ones.
 # After running the app once successfully, you can remove this block.
-try:
-    with conn.session as s:
-        # Step 1: Check if the old table 'ulubione_rzeczy' exists and rename it
-        result = s.execute(text("SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = 'ulubione_rzeczy')"))
-        if result.fetchone()[0]:
-            st.warning("Migrating table name...")
-            s.execute(text('DROP TABLE IF EXISTS favorite_things;')) # Drop empty new table if it exists
-            s.execute(text('ALTER TABLE ulubione_rzeczy RENAME TO favorite_things;'))
-            s.commit()
-            st.success("Table renamed. Refreshing...")
-            st.rerun()
-
-        # Step 2: Check if old columns exist in 'favorite_things' and rename them
-        result = s.execute(text("SELECT EXISTS (SELECT FROM information_schema.columns WHERE table_name = 'favorite_things' AND column_name = 'nazwa')"))
-        if result.fetchone()[0]:
-            st.warning("Migrating column names...")
-            s.execute(text('ALTER TABLE favorite_things RENAME COLUMN nazwa TO name;'))
-            s.execute(text('ALTER TABLE favorite_things RENAME COLUMN opis TO description;'))
-            s.commit()
-            st.success("Columns renamed. Your data is fully restored. Refreshing...")
-            st.rerun()
+# The checks run only once per user session instead of on every rerun.
+if "migrated" not in st.session_state:
+    try:
+        with conn.session as s:
+            # Check for the old table and the old columns in a single round-trip
+            # (read-only, so nothing is committed unless a rename below actually runs)
+            # Both probes look only in the public schema, where the app's tables live
+            old_table_exists, old_columns_exist = s.execute(text("""
+                SELECT
+                    to_regclass('public.ulubione_rzeczy') IS NOT NULL AS old_table,
+                    EXISTS (SELECT FROM information_schema.columns WHERE table_schema = 'public' AND table_name = 'favorite_things' AND column_name = 'nazwa') AS old_columns
+            """)).fetchone()
+
+            # Step 1: If the old table 'ulubione_rzeczy' exists, rename it
+            if old_table_exists:
+                st.warning("Migrating table name...")
+                # Both statements are sent in a single round-trip (no bind parameters, so the driver
+                # passes the string through as one multi-statement query)
+                s.execute(text("""
+                    DROP TABLE IF EXISTS favorite_things; -- Drop empty new table if it exists
+                    ALTER TABLE ulubione_rzeczy RENAME TO favorite_things;
+                """))
+                s.commit()
+                st.success("Table renamed. Refreshing...")
+                st.rerun()
+
+            # Step 2: If old columns exist in 'favorite_things', rename them
+            if old_columns_exist:
+                st.warning("Migrating column names...")
+                s.execute(text("""
+                    ALTER TABLE favorite_things RENAME COLUMN nazwa TO name;
+                    ALTER TABLE favorite_things RENAME COLUMN opis TO description;
+                """))
+                s.commit()
+                st.success("Columns renamed. Your data is fully restored. Refreshing...")
+                st.rerun()
+
+        st.session_state.migrated = True
+
+    except Exception as e:
+        st.error(f"An error occurred during data migration: {e}")
+        st.stop()
+
 
+# Create the table on app startup
+try:
+    db.bootstrap_schema()
 except Exception as e:
-    st.error(f"An error occurred during data migration: {e}")
-    st.stop()
+    st.error(f"Error while creating table: {e}")
 
+# --- Pagination state (stack of page cursors, the last one is the current page) ---
+if "page_cursors" not in st.session_state:
+    st.session_state.page_cursors = [db.FIRST_PAGE_CURSOR]
 
-# --- Function to create the table ---
-def create_table_if_not_exists():
-    try:
-        with conn.session as s:
-            s.execute(text("""
-                CREATE TABLE IF NOT EXISTS favorite_things (
-                    id SERIAL PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL,
-                    description TEXT
-                );
-            """))
-            s.commit()
-    except Exception as e:
-        st.error(f"Error while creating table: {e}")
+def go_to_next_page(last_id):
+    st.session_state.page_cursors.append(int(last_id))
 
-# Call the table creation function on app startup
-create_table_if_not_exists()
+def go_to_previous_page():
+    st.session_state.page_cursors.pop()
 
 # --- Main Application Interface ---
 st.title("My Favorite Things List")
@@ -71,12 +87,17 @@ with st.expander(" Add a new favorite thing", expanded=False):
         if add_button:
             if new_thing_name:
                 try:
-                    with conn.session as s:
-                        s.execute(
-                            text('INSERT INTO favorite_things (name, description) VALUES (:name_param, :desc_param);'),
-                            params=dict(name_param=new_thing_name, desc_param=new_thing_description)
+                    new_row = db.insert_thing(new_thing_name, new_thing_description)
+                    # Show the returned row on top of the page instead of re-reading the table on this run
+                    # (only the first page shows the newest things)
+                    if "shown_page" in st.session_state and len(st.session_state.page_cursors) == 1:
+                        shown_df, has_next_page = st.session_state.shown_page
+                        patched_df = db.prepend_thing(shown_df, new_row)
+                        # A row pushed off the end of the page means there is now a next page
+                        st.session_state.patched_page = (
+                            patched_df.head(db.PAGE_SIZE),
+                            has_next_page or len(patched_df) > db.PAGE_SIZE
                         )
-                        s.commit()
                     st.success(f"Added to favorites: '{new_thing_name}'!")
                 except Exception as e:
                     st.error(f"Error while adding thing: {e}")
@@ -86,9 +107,17 @@ with st.expander(" Add a new favorite thing", expanded=False):
 # --- READ Section (Displaying the list of things) ---
 st.header(" My Favorite Things")
 try:
-    # We bypass conn.query to avoid the hashing issue with the text() object
-    with conn.session as s:
-        favorite_things_df = pd.read_sql(text('SELECT id, name, description FROM favorite_things ORDER BY id DESC;'), s.connection())
+    # Right after an INSERT/DELETE the page patched in memory is shown once instead of re-reading it;
+    # every other run reads through the shared cache, which each write clears.
+    # Only one page of rows is fetched and sent to the browser, whatever the table size.
+    page = st.session_state.pop("patched_page", None)
+    if page is None:
+        # The page is fetched with one extra row that only tells whether a next page exists
+        page_df = db.load_things(st.session_state.page_cursors[-1])
+        page = (page_df.head(db.PAGE_SIZE), len(page_df) > db.PAGE_SIZE)
+    st.session_state.shown_page = page
+    favorite_things_df, has_next_page = page
+    page_number = len(st.session_state.page_cursors)
 
     if not favorite_things_df.empty:
         st.dataframe(
@@ -101,37 +130,52 @@ try:
                 "description": st.column_config.TextColumn("Description")
             }
         )
+    elif page_number > 1:
+        st.info("There are no more things on this page.")
     else:
         st.info("You don't have any favorite things yet. Add something in the section above!")
+
+    # Page navigation, shown only when there is more than one page
+    if page_number > 1 or has_next_page:
+        previous_col, page_col, next_col = st.columns([1, 2, 1])
+        previous_col.button("Previous page", on_click=go_to_previous_page, disabled=page_number == 1)
+        page_col.caption(f"Page {page_number}")
+        next_col.button(
+            "Next page",
+            on_click=go_to_next_page,
+            args=(favorite_things_df["id"].min(),), # The last row of this page is the cursor for the next one
+            disabled=not has_next_page or favorite_things_df.empty # An emptied page has no cursor
+        )
 except Exception as e:
     st.error(f"Error while reading data: {e}")
     # In case of an error, create an empty DataFrame to avoid a NameError in the DELETE section
-    favorite_things_df = pd.DataFrame()
+    favorite_things_df = db.empty_things()
 
 
 # --- DELETE Section (Removing things) ---
 st.header(" Remove thing from list")
 if not favorite_things_df.empty: # We use the DataFrame fetched in the READ section
-    # Create a dictionary mapping "ID: Name" to just the ID for easier processing
-    delete_options_dict = {f"{row.id}: {row.name}": row.id for row in favorite_things_df.itertuples()}
-    
-    if delete_options_dict: # Check if there are any options to remove
-        selected_option_str = st.selectbox(
+    # Index the names by ID so the selectbox can keep plain IDs and look up labels directly
+    name_by_id = favorite_things_df.set_index("id")["name"]
+
+    if not name_by_id.empty: # Check if there are any options to remove
+        thing_id_to_delete = st.selectbox(
             "Select a thing to remove:",
-            options=list(delete_options_dict.keys()) # List of keys as options
+            options=name_by_id.index.tolist(), # List of IDs as options
+            format_func=lambda thing_id: f"{thing_id}: {name_by_id[thing_id]}"
         )
 
         if st.button("Remove Selected Thing", type="primary"): # type="primary" for a red button
-            if selected_option_str:
-                thing_id_to_delete = delete_options_dict[selected_option_str]
+            if thing_id_to_delete is not None:
                 try:
-                    with conn.session as s:
-                        s.execute(
-                            text('DELETE FROM favorite_things WHERE id = :id_param;'),
-                            params=dict(id_param=thing_id_to_delete)
-                        )
-                        s.commit()
-                    st.success(f"Removed thing: '{selected_option_str.split(': ', 1)[1]}'!")
+                    db.delete_thing(thing_id_to_delete)
+                    # Drop the row locally instead of re-reading the table on the rerun
+                    # (rows older than this page are untouched, so has_next_page stays as it was)
+                    st.session_state.patched_page = (
+                        favorite_things_df[favorite_things_df["id"] != thing_id_to_delete],
+                        has_next_page
+                    )
+                    st.success(f"Removed thing: '{name_by_id[thing_id_to_delete]}'!")
                     st.rerun() # Rerun to refresh the list
                 except Exception as e:
                     st.error(f"Error while removing thing: {e}")
@@ -148,9 +192,9 @@ else:
 with st.expander(" Developer Options"):
     if st.button("HARD RESET DATABASE (will drop table)", type="primary"):
         try:
-            with conn.session as s:
-                s.execute(text('DROP TABLE IF EXISTS favorite_things;'))
-                s.commit()
+            db.drop_table()
+            st.session_state.pop("shown_page", None)
+            st.session_state.page_cursors = [db.FIRST_PAGE_CURSOR]
             st.success("Table 'favorite_things' has been dropped.")
             st.info("Refresh the page (F5) to restart the app and recreate the table.")
             st.stop()
@@ -0,0 +1,107 @@
+import streamlit as st
+import pandas as pd
+from sqlalchemy import Column, Integer, MetaData, String, Table, Text, insert, text # Import the text function and Core constructs
+from sqlalchemy.schema import CreateTable
+
+# --- SQL statements (built once and reused on every rerun) ---
+SELECT_STMT = text('SELECT id, name, description FROM favorite_things WHERE id < :before_id ORDER BY id DESC LIMIT :limit')
+# INSERT is a Core construct so that executing it with a list of rows is batched by SQLAlchemy
+# into multi-row VALUES statements ("insertmanyvalues") instead of one round-trip per row.
+# It needs a real Table with the primary key declared so the returned rows can be matched to the input order.
+FAVORITE_THINGS = Table(
+    "favorite_things",
+    MetaData(),
+    Column("id", Integer, primary_key=True),
+    Column("name", String(255), nullable=False),
+    Column("description", Text),
+)
+INSERT_STMT = insert(FAVORITE_THINGS).returning(
+    FAVORITE_THINGS.c.id, FAVORITE_THINGS.c.name, FAVORITE_THINGS.c.description,
+    sort_by_parameter_order=True
+)
+DELETE_STMT = text('DELETE FROM favorite_things WHERE id = :id_param;')
+
+# --- Pagination (keyset: each page starts below the last ID of the previous one) ---
+PAGE_SIZE = 50
+FIRST_PAGE_CURSOR = 2**31 # Above any SERIAL id, so the first page starts at the newest row
+
+# --- Column types of the list (Arrow-backed strings instead of Python object columns) ---
+THINGS_DTYPES = {"id": "int32", "name": "string[pyarrow]", "description": "string[pyarrow]"}
+
+
+# --- Connection Setup (Streamlit reads from .streamlit/secrets.toml automatically) ---
+# Extra st.connection kwargs are passed straight to sqlalchemy.create_engine.
+# pre_ping/recycle keep pooled connections from going stale after idle periods.
+POOL_KWARGS = dict(pool_size=5, max_overflow=10, pool_pre_ping=True, pool_recycle=1800)
+
+
+def get_connection(name="postgresql", **kwargs):
+    # st.connection caches the engine, so its pool is shared across reruns and users
+    return st.connection(name, type="sql", **POOL_KWARGS, **kwargs)
+
+
+# --- Function to create the table (runs once per server process, not on every rerun) ---
+@st.cache_resource
+def bootstrap_schema():
+    with get_connection().session as s:
+        # The DDL is generated from FAVORITE_THINGS, so the table and INSERT_STMT share one definition
+        s.execute(CreateTable(FAVORITE_THINGS, if_not_exists=True))
+        s.commit()
+
+
+# --- Function to load one page of things (cached between reruns) ---
+# One row more than a page is fetched by default, to tell whether a next page exists.
+@st.cache_data(ttl=60)
+def load_things(before_id=FIRST_PAGE_CURSOR, limit=PAGE_SIZE + 1):
+    # We bypass conn.query to avoid the hashing issue with the text() object
+    params = dict(before_id=before_id, limit=limit)
+
+    # A page is small, so it is read in one go; a server-side cursor would only add round-trips.
+    with get_connection().session as s:
+        return pd.read_sql(SELECT_STMT, s.connection(), params=params).astype(THINGS_DTYPES)
+
+
+# --- Helpers to build list DataFrames without a database round-trip ---
+def empty_things():
+    return pd.DataFrame(columns=list(THINGS_DTYPES)).astype(THINGS_DTYPES)
+
+
+def prepend_thing(things_df, row):
+    # row is (id, name, description), as returned by INSERT_STMT; the column order is fixed explicitly
+    new_df = pd.DataFrame([tuple(row)], columns=list(THINGS_DTYPES)).astype(THINGS_DTYPES)
+    return pd.concat([new_df, things_df.astype(THINGS_DTYPES)], ignore_index=True)
+
+
+# --- Functions to modify the list (each one invalidates the shared cache) ---
+def insert_things(things):
+    # things is a list of (name, description) pairs; the returned rows are in the same order
+    with get_connection().session as s:
+        new_rows = s.execute(
+            INSERT_STMT,
+            [dict(name=name, description=description) for name, description in things]
+        ).fetchall()
+        s.commit()
+    load_things.clear()
+    return new_rows
+
+
+def insert_thing(name, description):
+    return insert_things([(name, description)])[0]
+
+
+def delete_thing(thing_id):
+    with get_connection().session as s:
+        s.execute(
+            DELETE_STMT,
+            params=dict(id_param=thing_id)
+        )
+        s.commit()
+    load_things.clear()
+
+
+def drop_table():
+    with get_connection().session as s:
+        s.execute(text('DROP TABLE IF EXISTS favorite_things;'))
+        s.commit()
+    load_things.clear()
+    bootstrap_schema.clear() # Recreate the table on the next run
@@ -0,0 +1,62 @@
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from projekt_01 import db
+
+
+class SQLiteConnection:
+    # Stands in for st.connection: only the .session attribute is used by db
+    def __init__(self, engine):
+        self.engine = engine
+
+    @property
+    def session(self):
+        return Session(self.engine)
+
+
+def test_insert_things_returns_rows_in_input_order(monkeypatch):
+    engine = create_engine("sqlite://")
+    db.FAVORITE_THINGS.metadata.create_all(engine)
+    monkeypatch.setattr(db, "get_connection", lambda: SQLiteConnection(engine))
+
+    new_rows = db.insert_things([("Tea", "Green"), ("Books", None), ("Cats", "All of them")])
+
+    assert [tuple(row) for row in new_rows] == [
+        (1, "Tea", "Green"),
+        (2, "Books", None),
+        (3, "Cats", "All of them"),
+    ]
+
+
+
+def test_get_connection_builds_a_pooled_engine(tmp_path):
+    # A file database, because in-memory SQLite uses a pool without max_overflow
+    conn = db.get_connection("test_sqlite", url=f"sqlite:///{tmp_path / 'things.db'}")
+
+    with conn.session as s:
+        assert s.execute(text("SELECT 1")).scalar() == 1
+    assert conn.engine.pool.size() == db.POOL_KWARGS["pool_size"]
+
+
+def test_prepend_thing_keeps_column_order_and_dtypes():
+    things_df = db.prepend_thing(db.empty_things(), (1, "Tea", "Green"))
+    things_df = db.prepend_thing(things_df, (2, "Books", None))
+
+    assert list(things_df.columns) == list(db.THINGS_DTYPES)
+    assert things_df.dtypes.to_dict() == {
+        column: pd.api.types.pandas_dtype(dtype) for column, dtype in db.THINGS_DTYPES.items()
+    }
+    assert things_df["id"].tolist() == [2, 1]
+
+
+def test_bootstrap_schema_creates_the_table_once(monkeypatch):
+    engine = create_engine("sqlite://")
+    monkeypatch.setattr(db, "get_connection", lambda: SQLiteConnection(engine))
+
+    db.bootstrap_schema.clear()
+    db.bootstrap_schema()
+    db.bootstrap_schema.clear()
+    db.bootstrap_schema() # IF NOT EXISTS: a second run must not fail
+
+    assert db.insert_thing("Tea", None).id == 1